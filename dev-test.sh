@@ -19,7 +19,7 @@ if [ ! -d "tests" ]; then
 fi
 
 # Run pytest if test files exist
-if [ -f "tests/test_*.py" ] || [ -f "test_*.py" ]; then
+if compgen -G "tests/test_*.py" > /dev/null || compgen -G "test_*.py" > /dev/null; then
     echo "Running pytest with coverage..."
     pytest --cov=. --cov-report=term-missing --cov-report=html -v
     echo ""
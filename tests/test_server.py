@@ -0,0 +1,114 @@
+"""End-to-end checks for garage_server.py against a throwaway database."""
+import hashlib
+import http.client
+import json
+import sqlite3
+import threading
+import urllib.parse
+
+import pytest
+
+import garage_server
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    garage_server.DB_FILE = str(tmp_path_factory.mktemp('db') / 'garage_test.db')
+    garage_server.init_database()
+    httpd = garage_server.GarageServer(('127.0.0.1', 0), garage_server.GarageRequestHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(port, method, path, body=None, headers=None):
+    headers = dict(headers or {})
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode()
+        headers['Content-Type'] = 'application/json'
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    try:
+        conn.request(method, path, data, headers)
+        response = conn.getresponse()
+        payload = response.read()
+        return response.status, json.loads(payload or b'null'), response.getheader('ETag')
+    finally:
+        conn.close()
+
+
+def test_customer_delete_invalidates_cascaded_lists(server):
+    status, body, _ = request(server, 'POST', '/api/customers',
+                              {'name': 'Cascade Test', 'email': 'cascade@example.com', 'phone': '555-0100'})
+    assert status == 200 and body['success']
+    customer_id = body['id']
+    status, body, _ = request(server, 'POST', '/api/vehicles',
+                              {'customer_id': customer_id, 'make': 'Saab', 'model': '900',
+                               'year': 1990, 'license_plate': 'CASCADE'})
+    vehicle_id = body['id']
+    status, body, _ = request(server, 'POST', '/api/services',
+                              {'vehicle_id': vehicle_id, 'service_type': 'Inspection', 'cost': 40})
+    service_id = body['id']
+    status, body, _ = request(server, 'POST', '/api/bookings',
+                              {'customer_id': customer_id, 'vehicle_id': vehicle_id,
+                               'booking_date': '2030-01-01', 'booking_time': '09:00'})
+    booking_id = body['id']
+
+    # Prime the cached payloads, then delete only the customer
+    etags = {}
+    for resource, row_id in (('vehicles', vehicle_id), ('services', service_id), ('bookings', booking_id)):
+        status, rows, etags[resource] = request(server, 'GET', f'/api/{resource}')
+        assert row_id in [row['id'] for row in rows]
+    status, body, _ = request(server, 'DELETE', f'/api/customers/{customer_id}')
+    assert status == 200 and body['success']
+
+    for resource, row_id in (('vehicles', vehicle_id), ('services', service_id), ('bookings', booking_id)):
+        status, rows, _ = request(server, 'GET', f'/api/{resource}',
+                                  headers={'If-None-Match': etags[resource]})
+        assert status == 200, f'{resource} was served from the stale cache'
+        assert row_id not in [row['id'] for row in rows]
+
+
+@pytest.mark.parametrize('resource', ['parts', 'services', 'bookings'])
+def test_page_after_deleted_cursor_row(server, resource):
+    _, everything, _ = request(server, 'GET', f'/api/{resource}')
+    status, first, _ = request(server, 'GET', f'/api/{resource}?limit=1')
+    assert status == 200 and first['next_cursor'] is not None
+    deleted = first['rows'][-1]['id']
+    status, body, _ = request(server, 'DELETE', f'/api/{resource}/{deleted}')
+    assert status == 200 and body['success']
+
+    after = urllib.parse.quote(first['next_cursor'])
+    status, rest, _ = request(server, 'GET', f'/api/{resource}?limit=500&after={after}')
+    assert status == 200
+    assert [row['id'] for row in rest['rows']] == [row['id'] for row in everything if row['id'] != deleted]
+
+
+def test_page_rejects_malformed_cursor(server):
+    status, body, _ = request(server, 'GET', '/api/parts?limit=5&after=not-a-cursor')
+    assert status == 400 and not body['success']
+
+
+def test_legacy_sha256_login_is_rehashed(server):
+    legacy_hash = hashlib.sha256(b'legacy-pass').hexdigest()
+    conn = sqlite3.connect(garage_server.DB_FILE)
+    conn.execute("INSERT INTO users (username, password_hash, role) VALUES ('legacy', ?, 'staff')",
+                 (legacy_hash,))
+    conn.commit()
+
+    status, body, _ = request(server, 'POST', '/api/login', {'username': 'legacy', 'password': 'legacy-pass'})
+    assert status == 200 and body['success']
+    stored = conn.execute("SELECT password_hash FROM users WHERE username = 'legacy'").fetchone()[0]
+    conn.close()
+    assert stored.startswith('scrypt$')
+    assert garage_server.verify_password('legacy-pass', stored)
+
+    status, body, _ = request(server, 'POST', '/api/login', {'username': 'legacy', 'password': 'legacy-pass'})
+    assert status == 200 and body['success']
+
+
+def test_bulk_add_requires_a_list(server):
+    status, body, _ = request(server, 'POST', '/api/customers/bulk', {})
+    assert status == 400 and not body['success']